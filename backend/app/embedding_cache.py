@@ -0,0 +1,170 @@
+# backend/app/embedding_cache.py
+
+import asyncio
+import hashlib
+import logging
+import os
+import tempfile
+from collections import OrderedDict
+
+import numpy as np
+import torch
+
+# Optional: SIMD-accelerated similarity kernels (AVX2/AVX-512/NEON)
+try:
+    import simsimd
+    _HAS_SIMSIMD = True
+except ImportError:
+    simsimd = None
+    _HAS_SIMSIMD = False
+
+logger = logging.getLogger("embedding_cache")
+
+# ----------------- Cache configuration -----------------
+MODEL_NAME = "all-MiniLM-L6-v2"
+MAX_MEMORY_ENTRIES = 10_000
+DISK_CACHE_DIR = os.path.join(tempfile.gettempdir(), "resume_matcher_emb_cache")
+
+# In-memory LRU: blake2b(text) -> np.ndarray (float32, L2-normalized)
+_memory_cache = OrderedDict()
+
+
+def _text_key(text: str) -> str:
+    return hashlib.blake2b(f"{MODEL_NAME}::{text}".encode("utf-8"), digest_size=16).hexdigest()
+
+
+def _disk_path(key: str) -> str:
+    return os.path.join(DISK_CACHE_DIR, key + ".npy")
+
+
+def _disk_get(key: str):
+    path = _disk_path(key)
+    try:
+        if os.path.exists(path):
+            return np.load(path).astype(np.float32)
+    except Exception as e:
+        logger.warning(f"⚠️ Could not read cached embedding {key}: {e}")
+    return None
+
+
+def _disk_put(key: str, embedding: np.ndarray):
+    try:
+        os.makedirs(DISK_CACHE_DIR, exist_ok=True)
+        # Store as float16 to halve on-disk bytes; precision loss is negligible for cosine
+        np.save(_disk_path(key), embedding.astype(np.float16))
+    except Exception as e:
+        logger.warning(f"⚠️ Could not persist embedding {key}: {e}")
+
+
+def _memory_put(key: str, embedding: np.ndarray):
+    _memory_cache[key] = embedding
+    _memory_cache.move_to_end(key)
+    while len(_memory_cache) > MAX_MEMORY_ENTRIES:
+        _memory_cache.popitem(last=False)
+
+
+def cached_encode(model, texts, batch_size: int = 64) -> np.ndarray:
+    """
+    Encode texts with the given SentenceTransformer, skipping the transformer
+    forward pass for any string seen before (in-process LRU, then disk store).
+    Only cache misses are batched through model.encode; hits and misses are
+    stitched back together in input order.
+
+    Invariant: every embedding in the cache is stored L2-normalized, so all
+    downstream similarity code can use plain dot products instead of cosine.
+    """
+    if isinstance(texts, str):
+        texts = [texts]
+
+    keys = [_text_key(t) for t in texts]
+    embeddings = [None] * len(texts)
+    uncached_idx = []
+
+    for i, key in enumerate(keys):
+        if key in _memory_cache:
+            _memory_cache.move_to_end(key)
+            embeddings[i] = _memory_cache[key]
+            continue
+        disk_hit = _disk_get(key)
+        if disk_hit is not None:
+            _memory_put(key, disk_hit)
+            embeddings[i] = disk_hit
+        else:
+            uncached_idx.append(i)
+
+    if uncached_idx:
+        # inference_mode is stronger than the no_grad sentence-transformers
+        # uses internally: it also skips version counters and view tracking
+        with torch.inference_mode():
+            fresh = model.encode(
+                [texts[i] for i in uncached_idx],
+                batch_size=batch_size,
+                convert_to_numpy=True,
+                normalize_embeddings=True,
+                show_progress_bar=False,
+            )
+        for j, i in enumerate(uncached_idx):
+            embedding = np.asarray(fresh[j], dtype=np.float32)
+            _memory_put(keys[i], embedding)
+            _disk_put(keys[i], embedding)
+            embeddings[i] = embedding
+
+    return np.stack(embeddings)
+
+
+class EncodeBatcher:
+    """
+    Coalesces concurrent encode requests into one pooled forward pass.
+    The first caller opens a short window; requests arriving inside it are
+    appended, then everything pending goes through a single cached_encode
+    call and each caller gets its slice back. Under concurrent load this
+    replaces many tiny transformer launches with one well-filled batch.
+    """
+
+    def __init__(self, model, window_ms: float = 5.0, batch_size: int = 64):
+        self._model = model
+        self._window = window_ms / 1000.0
+        self._batch_size = batch_size
+        self._pending = []  # list of (texts, future)
+        self._flusher = None
+
+    async def encode(self, texts) -> np.ndarray:
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((list(texts), future))
+        if self._flusher is None:
+            self._flusher = asyncio.ensure_future(self._flush_after_window())
+        return await future
+
+    async def _flush_after_window(self):
+        await asyncio.sleep(self._window)
+        pending, self._pending, self._flusher = self._pending, [], None
+
+        all_texts = [t for texts, _ in pending for t in texts]
+        try:
+            embeddings = await asyncio.to_thread(
+                cached_encode, self._model, all_texts, self._batch_size
+            )
+        except Exception as e:
+            for _, future in pending:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        offset = 0
+        for texts, future in pending:
+            if not future.done():
+                future.set_result(embeddings[offset:offset + len(texts)])
+            offset += len(texts)
+
+
+def similarity_matrix(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """
+    Cosine similarity matrix between two sets of row vectors.
+    Uses simsimd's vectorized kernels when available; otherwise falls back to
+    a plain matmul (valid because cached embeddings are stored L2-normalized).
+    """
+    if _HAS_SIMSIMD:
+        # simsimd returns cosine *distance*; convert back to similarity
+        return 1.0 - np.asarray(simsimd.cdist(a, b, metric="cosine"), dtype=np.float32)
+    return a @ b.T
@@ -1,57 +1,102 @@
 from fastapi import APIRouter, UploadFile, File, Form, HTTPException
 from pydantic import BaseModel
-import tempfile
 import os
-import fitz  # PyMuPDF
-import docx2txt
 import random
 import re
-from sentence_transformers import SentenceTransformer, util
+
+import numpy as np
+
+from app.embedding_cache import cached_encode
+from app.models import get_sentence_model
+from app.utils import extract_text_cached
+
+# Optional: true multi-pattern DFA matching for skill extraction
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
 
 router = APIRouter(prefix="/interview", tags=["Mock Interview"])
 
-# Load the model once
-model = SentenceTransformer("all-MiniLM-L6-v2")
+SKILLS = [
+    "python", "java", "javascript", "react", "node", "django", "flask", "fastapi",
+    "aws", "azure", "docker", "sql", "html", "css",
+    "machine learning", "nlp", "pandas", "numpy",
+    "leadership", "communication", "teamwork", "problem solving"
+]
+
+# Compile one alternation pattern at import: a single NFA traversal instead
+# of one regex pass per skill, with no per-call compile-cache lookups.
+# IGNORECASE lets the fallback scan the original text without materializing
+# a lowered copy of the whole resume first
+_SKILL_RE = re.compile(r"\b(" + "|".join(re.escape(s) for s in SKILLS) + r")\b", re.IGNORECASE)
+
+# Build the skill automaton once at import: one O(len(text)) scan replaces
+# one regex pass per skill.
+_SKILL_AUTOMATON = None
+if ahocorasick:
+    _SKILL_AUTOMATON = ahocorasick.Automaton()
+    for _skill in SKILLS:
+        _SKILL_AUTOMATON.add_word(_skill, _skill)
+    _SKILL_AUTOMATON.make_automaton()
+
+BASE_QUESTIONS = (
+    "Can you describe your experience working with {}?",
+    "What challenges have you faced when using {}?",
+    "How do you stay updated with the latest trends in {}?",
+    "Can you explain a project where you used {}?",
+    "What are some best practices you follow when working with {}?",
+)
+
+GENERAL_QUESTIONS = [
+    "Tell me about yourself.",
+    "Why do you want to work with our company?",
+    "What is your biggest strength?",
+    "Describe a time you handled a difficult situation.",
+    "Where do you see yourself in 5 years?",
+]
+
+# Pre-expand every (skill x template) combination once at import so request
+# handlers only sample indices instead of formatting strings
+QUESTION_BANK = {skill: [tpl.format(skill) for tpl in BASE_QUESTIONS] for skill in SKILLS}
+
+# Shared model singleton (single copy of the weights across modules)
+model = get_sentence_model()
 
 # --------------------------------------
 # 🧩 Utility functions
 # --------------------------------------
 def extract_text(file: UploadFile) -> str:
-    """Extract text from PDF, DOCX, or TXT files."""
+    """Extract text from PDF, DOCX, or TXT files via the shared cached extractor."""
     suffix = os.path.splitext(file.filename)[1].lower()
-    with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as tmp:
-        tmp.write(file.file.read())
-        tmp_path = tmp.name
+    if suffix not in (".pdf", ".docx", ".txt"):
+        raise ValueError("Unsupported file format.")
 
-    text = ""
-    try:
-        if suffix == ".pdf":
-            with fitz.open(tmp_path) as doc:
-                for page in doc:
-                    text += page.get_text("text")
-        elif suffix == ".docx":
-            text = docx2txt.process(tmp_path)
-        elif suffix == ".txt":
-            with open(tmp_path, "r", encoding="utf-8", errors="ignore") as f:
-                text = f.read()
-        else:
-            raise ValueError("Unsupported file format.")
-    finally:
-        os.remove(tmp_path)
-
-    return text.strip()
+    return extract_text_cached(file.file.read(), suffix)
 
 
 def extract_skills(text: str):
-    """Detect key skills."""
-    skills = [
-        "python", "java", "javascript", "react", "node", "django", "flask", "fastapi",
-        "aws", "azure", "docker", "sql", "html", "css",
-        "machine learning", "nlp", "pandas", "numpy",
-        "leadership", "communication", "teamwork", "problem solving"
-    ]
-    text = text.lower()
-    return [s for s in skills if re.search(rf"\b{s}\b", text)]
+    """Detect key skills in a single linear scan over the text."""
+    if _SKILL_AUTOMATON is not None:
+        # The automaton matches exact bytes, so this path still needs one
+        # lowered copy of the text
+        text = text.lower()
+        found = set()
+        for end, skill in _SKILL_AUTOMATON.iter(text):
+            start = end - len(skill) + 1
+            # Post-filter on surrounding chars to preserve \b semantics
+            if (start == 0 or not text[start - 1].isalnum()) and \
+               (end + 1 >= len(text) or not text[end + 1].isalnum()):
+                found.add(skill)
+                if len(found) == len(SKILLS):
+                    break  # every skill matched: no point scanning further
+        return [s for s in SKILLS if s in found]
+
+    # Fallback when pyahocorasick is not installed: one case-insensitive pass
+    # with the precompiled alternation instead of len(SKILLS) separate
+    # searches, and no full-text .lower() allocation
+    found = {m.casefold() for m in _SKILL_RE.findall(text)}
+    return [s for s in SKILLS if s in found]
 
 # --------------------------------------
 # 🎯 Generate Interview Questions
@@ -77,30 +122,15 @@ async def generate_interview_questions(
     if not combined_skills:
         combined_skills = ["communication", "problem solving", "teamwork"]
 
-    base_questions = [
-        "Can you describe your experience working with {}?",
-        "What challenges have you faced when using {}?",
-        "How do you stay updated with the latest trends in {}?",
-        "Can you explain a project where you used {}?",
-        "What are some best practices you follow when working with {}?",
-    ]
-
-    general_questions = [
-        "Tell me about yourself.",
-        "Why do you want to work with our company?",
-        "What is your biggest strength?",
-        "Describe a time you handled a difficult situation.",
-        "Where do you see yourself in 5 years?",
-    ]
-
     skill_questions = [
-        random.choice(base_questions).format(skill)
+        random.choice(QUESTION_BANK[skill]) if skill in QUESTION_BANK
+        else random.choice(BASE_QUESTIONS).format(skill)
         for skill in random.sample(combined_skills, min(5, len(combined_skills)))
     ]
 
     return {
-        "total_questions": len(general_questions) + len(skill_questions),
-        "questions": general_questions + skill_questions,
+        "total_questions": len(GENERAL_QUESTIONS) + len(skill_questions),
+        "questions": GENERAL_QUESTIONS + skill_questions,
     }
 
 # --------------------------------------
@@ -110,6 +140,13 @@ class EvaluationRequest(BaseModel):
     questions: list[str]
     answers: list[str]
 
+# Feedback buckets indexed by how many thresholds (60, 80) a score clears
+_FEEDBACK_BUCKETS = np.array([
+    "Needs more detail and structure.",
+    "Good, but can be improved.",
+    "Excellent answer!",
+])
+
 @router.post("/evaluate")
 async def evaluate_answers(data: EvaluationRequest):
     """Evaluate answers semantically using SentenceTransformer."""
@@ -117,24 +154,23 @@ async def evaluate_answers(data: EvaluationRequest):
         if not data.questions or not data.answers or len(data.questions) != len(data.answers):
             raise HTTPException(status_code=400, detail="Questions and answers mismatch.")
 
-        scores = []
-        for q, a in zip(data.questions, data.answers):
-            q_emb = model.encode(q, convert_to_tensor=True)
-            a_emb = model.encode(a, convert_to_tensor=True)
-            sim = float(util.cos_sim(q_emb, a_emb))
-            scores.append(round(sim * 100, 2))
-
-        avg_score = round(sum(scores) / len(scores), 2)
-        feedback = [
-            "Excellent answer!" if s > 80 else
-            "Good, but can be improved." if s > 60 else
-            "Needs more detail and structure."
-            for s in scores
-        ]
+        # Encode all questions + answers in ONE batched forward pass instead of
+        # two model calls per pair (amortizes tokenizer + transformer overhead).
+        # Repeated questions/answers come straight out of the embedding cache.
+        n = len(data.questions)
+        embeddings = cached_encode(model, data.questions + data.answers, batch_size=64)
+        q_embs, a_embs = embeddings[:n], embeddings[n:]
+
+        # Embeddings are L2-normalized, so the row-wise dot product IS the cosine similarity
+        score_arr = np.round((q_embs * a_embs).sum(axis=1) * 100, 2)
+
+        # Branchless classification: bucket index = number of thresholds cleared
+        bucket_idx = (score_arr > 60).astype(int) + (score_arr > 80).astype(int)
+        feedback = _FEEDBACK_BUCKETS[bucket_idx].tolist()
 
         return {
-            "average_score": avg_score,
-            "individual_scores": scores,
+            "average_score": round(float(score_arr.mean()), 2),
+            "individual_scores": score_arr.tolist(),
             "feedback": feedback
         }
 
@@ -1,29 +1,49 @@
 # backend/app/main.py
 
 from fastapi import FastAPI, UploadFile, File, Form, HTTPException
-from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
+
+# orjson serializes large skill/analysis payloads several times faster than
+# stdlib json; fall back to the default response class when not installed
+try:
+    import orjson  # noqa: F401
+    from fastapi.responses import ORJSONResponse as JSONResponse
+except ImportError:
+    from fastapi.responses import JSONResponse
 from pydantic import BaseModel
-import fitz # PyMuPDF
-import docx2txt
+import hashlib
 import tempfile
 import os
 import re
 import logging
-import json 
-from sentence_transformers import SentenceTransformer, util
+import json
 import asyncio # For clean async file handling
+import subprocess
+from contextlib import asynccontextmanager
+
+import numpy as np
+
+import torch
 
 # Import the processor which contains the ML logic and model loading
-from app import resume_processor 
+from app import resume_processor
+from app.embedding_cache import EncodeBatcher, cached_encode, similarity_matrix
+from app.models import get_sentence_model
+from app.utils import LRUCache, extract_text, extract_text_from_bytes
 
 # ----------------- Logging -----------------
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger("resume_matcher")
 
+# ----------------- Torch runtime tuning -----------------
+# Cap intra-op threads so concurrent requests don't oversubscribe the cores,
+# and drop autograd globally: this service only ever runs inference
+torch.set_num_threads(min(8, os.cpu_count() or 1))
+torch.set_grad_enabled(False)
+
 # ----------------- Global Caching -----------------
-# Simple in-memory cache to store resume content by a unique file name
-file_cache = {} 
+# Bounded in-memory cache to store resume content (previously an unbounded dict)
+file_cache = LRUCache(maxsize=256)
 
 # ----------------- Pydantic Models -----------------
 # Define the data structure for the Text Evaluation request
@@ -39,8 +59,47 @@ class BulkEvaluationRequest(BaseModel):
     # List of dictionaries: [{"question": "...", "answer": "..."}, ...]
     qa_pairs: list[dict] 
 
+# ----------------- Lifespan: load models once per worker -----------------
+model = None
+encode_batcher = None
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Structured startup: load and warm all models, failing fast if broken."""
+    global model, encode_batcher
+
+    # No try/except here on purpose: a worker without the encoder would
+    # silently return 0.0 scores, so refuse to start instead
+    model = get_sentence_model()
+
+    # Pre-warm: the first encode pays kernel tuning / allocator warmup costs,
+    # so spend them at startup instead of on the first user request. Use
+    # representative workload-length texts so the right kernel shapes get hit.
+    model.encode(
+        ["hello world", "python developer with 5 years of experience"] * 4,
+        batch_size=8,
+        show_progress_bar=False,
+    )
+    # Pre-fill the embedding cache with the fixed skill vocabulary: /match
+    # then gathers cached rows instead of running the transformer per request
+    cached_encode(model, resume_processor.ALL_SKILLS)
+    logger.info("✅ SentenceTransformer warmup + skill vocabulary encode complete.")
+
+    # Coalesces concurrent encode calls into pooled batches (see EncodeBatcher)
+    encode_batcher = EncodeBatcher(model)
+
+    # Load ML models from the processor
+    resume_processor.load_models()
+    logger.info("✅ Core ML models for ATS/Interview loaded!")
+
+    yield
+
 # ----------------- App init -----------------
-app = FastAPI(title="AI-Powered Resume & Interview Assistant")
+app = FastAPI(
+    title="AI-Powered Resume & Interview Assistant",
+    default_response_class=JSONResponse,
+    lifespan=lifespan,
+)
 
 # ----------------- CORS -----------------
 app.add_middleware(
@@ -51,84 +110,78 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# ----------------- Load model once -----------------
-model = None
-try:
-    logger.info("🔹 Loading SentenceTransformer model...")
-    model = SentenceTransformer("all-MiniLM-L6-v2")
-    logger.info("✅ SentenceTransformer model loaded!")
-except Exception as e:
-    logger.error(f"CRITICAL: Error loading SentenceTransformer: {e}")
-
-# Load ML models from the processor on startup
-resume_processor.load_models()
-logger.info("✅ Core ML models for ATS/Interview loaded!")
+# ----------------- Whisper (lazy shared singleton) -----------------
+_whisper_model = None
+_whisper_backend = None  # "faster" (CTranslate2) or "openai"
+
+def _get_whisper_model():
+    """Load the Whisper model once and share it across all audio requests."""
+    global _whisper_model, _whisper_backend
+    if _whisper_model is None:
+        try:
+            # CTranslate2 backend: int8 weights + SIMD decoder, ~4x faster on
+            # CPU than the reference implementation at the same model size
+            from faster_whisper import WhisperModel
+            logger.info("🔹 Loading faster-whisper 'base' (int8, one-time)...")
+            _whisper_model = WhisperModel("base", device="auto", compute_type="int8")
+            _whisper_backend = "faster"
+        except ImportError:
+            import whisper
+            device = "cuda" if torch.cuda.is_available() else "cpu"
+            logger.info(f"🔹 Loading Whisper model on {device} (one-time)...")
+            _whisper_model = whisper.load_model("base", device=device)
+            _whisper_backend = "openai"
+        logger.info("✅ Whisper model loaded!")
+    return _whisper_model
+
+
+def _transcribe_blocking(audio) -> str:
+    """Transcribe audio (blocking call; run via asyncio.to_thread)."""
+    whisper_model = _get_whisper_model()
+    if _whisper_backend == "faster":
+        # Greedy decode (beam_size=1) is plenty for short interview answers
+        segments, _ = whisper_model.transcribe(audio, beam_size=1)
+        return " ".join(segment.text for segment in segments).strip()
+    # fp16 decode only makes sense on CUDA
+    return whisper_model.transcribe(audio, fp16=torch.cuda.is_available())["text"].strip()
+
+
+def _decode_audio_bytes(audio_data: bytes) -> np.ndarray:
+    """Decode compressed audio bytes to 16kHz mono float32 via an ffmpeg pipe."""
+    # Whisper would shell out to ffmpeg anyway; piping the bytes straight
+    # through skips the tempfile write + re-read round-trip entirely
+    proc = subprocess.run(
+        ["ffmpeg", "-i", "pipe:0", "-f", "s16le", "-ar", "16000", "-ac", "1",
+         "-loglevel", "quiet", "pipe:1"],
+        input=audio_data,
+        capture_output=True,
+        check=True,
+    )
+    return np.frombuffer(proc.stdout, np.int16).astype(np.float32) / 32768.0
 
 
 # ----------------- Utility functions -----------------
-async def extract_text(file: UploadFile) -> str:
-    """Extract text from PDF, DOCX, or TXT files."""
-    file_content = await file.read()
-    
-    if not file_content:
-        return ""
-        
-    suffix = os.path.splitext(file.filename)[1].lower()
-    
-    # Use asyncio to run the blocking file operations in a thread pool
-    text = await asyncio.to_thread(_perform_text_extraction_blocking, file_content, suffix)
-
-    return text.strip()
-
-def _perform_text_extraction_blocking(file_content: bytes, suffix: str) -> str:
-    """Blocking part of text extraction running in a separate thread."""
-    text = ""
-    tmp_path = None
-    
-    try:
-        with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as tmp:
-            tmp.write(file_content)
-            tmp_path = tmp.name
-
-        if suffix == ".pdf":
-            with fitz.open(tmp_path) as doc:
-                text = "".join(page.get_text() for page in doc)
-        elif suffix == ".docx":
-            text = docx2txt.process(tmp_path)
-        elif suffix == ".txt":
-            with open(tmp_path, "r", encoding="utf-8", errors="ignore") as f:
-                text = f.read()
-        else:
-            logger.error(f"Unsupported file format: {suffix}")
-            return ""
-
-    except Exception as e:
-        logger.error(f"Error during text extraction of {suffix}: {e}")
-        return "" 
-    finally:
-        if tmp_path and os.path.exists(tmp_path):
-            os.remove(tmp_path)
-            
-    return text.strip()
-
-
-def semantic_skill_match(resume_skills: list[str], jd_skills: list[str], threshold: float = 0.6):
+async def semantic_skill_match(resume_skills: list[str], jd_skills: list[str], threshold: float = 0.6):
     """Find semantically similar skills between resume and JD using embeddings."""
     if not model or not resume_skills or not jd_skills:
         return [], 0.0
 
-    resume_embeddings = model.encode(resume_skills, convert_to_tensor=True)
-    jd_embeddings = model.encode(jd_skills, convert_to_tensor=True)
-    cosine_scores = util.cos_sim(resume_embeddings, jd_embeddings)
+    # One encode call for both lists, routed through the micro-batcher so
+    # concurrent /match requests share a single pooled forward pass.
+    # cached_encode underneath skips the transformer for known strings.
+    all_embeddings = await encode_batcher.encode(resume_skills + jd_skills)
+    resume_embeddings = all_embeddings[:len(resume_skills)]
+    jd_embeddings = all_embeddings[len(resume_skills):]
+    # SIMD kernels via simsimd when installed, else a plain matmul on normalized vectors
+    cosine_scores = similarity_matrix(resume_embeddings, jd_embeddings)
 
-    matched = set()
-    for i in range(len(resume_skills)):
-        for j in range(len(jd_skills)):
-            if float(cosine_scores[i][j]) >= threshold:
-                matched.add(jd_skills[j])
+    # One vectorized reduction instead of an O(R*J) Python double loop:
+    # a JD skill matches if ANY resume skill clears the threshold
+    matched_mask = (cosine_scores >= threshold).any(axis=0)
+    matched = [jd_skills[j] for j, hit in enumerate(matched_mask.tolist()) if hit]
 
     score = round((len(matched) / len(jd_skills)) * 100, 2) if jd_skills else 0.0
-    return list(matched), score
+    return matched, score
 
 
 # ----------------- Routes -----------------
@@ -137,46 +190,90 @@ def semantic_skill_match(resume_skills: list[str], jd_skills: list[str], thresho
 def health():
     return {"status": "ok"}
 
+# --- 0. Upload-once Route ---
+@app.post("/upload")
+async def upload_resume(resume: UploadFile = File(...)):
+    """
+    Extract and cache a resume once; returns a content-hash handle that
+    /analyze_resume and /match accept instead of re-uploading the file.
+    """
+    file_bytes = await resume.read()
+    if not file_bytes:
+        raise HTTPException(status_code=400, detail="Empty file.")
+
+    handle = hashlib.blake2b(file_bytes, digest_size=16).hexdigest()
+    if handle not in file_cache:
+        text = await extract_text_from_bytes(file_bytes, resume.filename)
+        if not text:
+            raise HTTPException(status_code=400, detail="Could not extract text from the file.")
+        file_cache[handle] = text
+
+    return {"handle": handle}
+
 # --- 1. ATS/ML Analysis Route (UPDATED FOR JD) ---
 @app.post("/analyze_resume")
 async def analyze_resume(
-    resume: UploadFile = File(...),
-    jd: UploadFile | None = File(None),      
-    jd_text: str | None = Form(None)         
+    resume: UploadFile | None = File(None),
+    jd: UploadFile | None = File(None),
+    jd_text: str | None = Form(None),
+    resume_handle: str | None = Form(None),
 ):
     """
     Performs comprehensive ATS/ML analysis and generates interview questions.
-    Now supports JD context for smarter question generation.
+    Accepts either a resume upload or a handle from /upload; supports JD
+    context for smarter question generation.
     """
+    resume_content = ""
     try:
-        # 1. Extract Text from Resume
-        resume_content = await extract_text(resume)
-        
-        if not resume_content:
-            raise HTTPException(status_code=400, detail="Could not extract text from the file.")
-            
-        # 2. Extract Text from JD (if provided)
+        # 1. Extract the JD context
         jd_content = ""
         if jd:
             jd_content = await extract_text(jd)
         elif jd_text:
             jd_content = jd_text.strip()
 
-        # 3. Cache the resume content for interview evaluation steps
-        file_cache[resume.filename] = resume_content 
+        # 2. Resolve the resume: cached handle, or the upload bytes (hashed
+        # into a collision-free handle the frontend echoes back later)
+        file_bytes = b""
+        if resume_handle:
+            resume_content = file_cache.get(resume_handle, "")
+            if not resume_content:
+                raise HTTPException(status_code=404, detail="Unknown resume handle. Upload the file again.")
+            resume_id = resume_handle
+        elif resume:
+            file_bytes = await resume.read()
+            resume_id = hashlib.blake2b(file_bytes, digest_size=16).hexdigest()
+        else:
+            raise HTTPException(status_code=400, detail="Provide a resume file or a resume_handle.")
 
-        # 4. Run the Analysis (Passing BOTH Resume and JD now)
-        analysis_result = resume_processor.perform_ats_analysis(resume_content, jd_content)
-        
-        # Add the filename to the response so the frontend knows the key for the cache
-        analysis_result['resume_name'] = resume.filename
+        # 3. Extract text if we came from an upload
+        if not resume_content:
+            resume_content = await extract_text_from_bytes(file_bytes, resume.filename)
+            if not resume_content:
+                raise HTTPException(status_code=400, detail="Could not extract text from the file.")
+            file_cache[resume.filename] = resume_content  # legacy filename lookups
+
+        # 4. Cache the resume content for interview evaluation steps
+        file_cache[resume_id] = resume_content
+
+        # 5. Run the Analysis (Passing BOTH Resume and JD now)
+        # CPU-bound (vectorize + tree walk + regex extraction): keep it off
+        # the event loop so concurrent requests still get served. Repeat
+        # resume/JD pairs hit the memo inside resume_processor, which only
+        # re-rolls the randomized questions and radar scores.
+        analysis_result = await asyncio.to_thread(
+            resume_processor.perform_ats_analysis, resume_content, jd_content
+        )
+
+        # Hand the content-hash handle to the frontend as the cache key
+        analysis_result['resume_name'] = resume_id
 
         return JSONResponse(content=analysis_result)
 
     except HTTPException:
         raise
     except Exception as e:
-        logger.exception(f"Error in /analyze_resume for {resume.filename}")
+        logger.exception("Error in /analyze_resume")
         return JSONResponse(
             status_code=500,
             content=resume_processor._get_empty_analysis_result(f"Analysis error: {str(e)}", resume_content)
@@ -186,27 +283,42 @@ async def analyze_resume(
 # --- 2. JD Match Route ---
 @app.post("/match")
 async def match_files(
-    resume: UploadFile = File(...),
+    resume: UploadFile | None = File(None),
     jd: UploadFile | None = File(None),
     jd_text: str | None = Form(None),
+    resume_handle: str | None = Form(None),
 ):
     """
     Compare resume and job description for skill match using semantic similarity.
+    Accepts either a resume upload or a handle from /upload.
     """
     try:
-        resume_text = await extract_text(resume)
-
-        if jd:
-            jd_text_final = await extract_text(jd)
-        elif jd_text:
-            jd_text_final = jd_text.strip()
+        if resume_handle:
+            resume_text = file_cache.get(resume_handle, "")
+            if not resume_text:
+                raise HTTPException(status_code=404, detail="Unknown resume handle. Upload the file again.")
+            jd_text_final = await extract_text(jd) if jd else None
+        elif resume and jd:
+            # Resume and JD extraction are independent thread-pool jobs: overlap them
+            resume_text, jd_text_final = await asyncio.gather(
+                extract_text(resume), extract_text(jd)
+            )
+        elif resume:
+            resume_text = await extract_text(resume)
+            jd_text_final = None
         else:
-            return {
-                "match_score": 0.0,
-                "resume_skills": resume_processor.extract_skills_from_text(resume_text),
-                "jd_skills": [],
-                "matched_skills": [],
-            }
+            raise HTTPException(status_code=400, detail="Provide a resume file or a resume_handle.")
+
+        if jd_text_final is None:
+            if jd_text:
+                jd_text_final = jd_text.strip()
+            else:
+                return {
+                    "match_score": 0.0,
+                    "resume_skills": resume_processor.extract_skills_from_text(resume_text),
+                    "jd_skills": [],
+                    "matched_skills": [],
+                }
 
         if not jd_text_final:
             raise HTTPException(status_code=400, detail="Could not extract text from JD file or JD text is empty.")
@@ -214,7 +326,7 @@ async def match_files(
         resume_skills = resume_processor.extract_skills_from_text(resume_text)
         jd_skills = resume_processor.extract_skills_from_text(jd_text_final)
 
-        matched_skills, match_score = semantic_skill_match(resume_skills, jd_skills)
+        matched_skills, match_score = await semantic_skill_match(resume_skills, jd_skills)
 
         return {
             "match_score": match_score,
@@ -248,31 +360,32 @@ async def evaluate_interview_audio(
             detail="Resume context is missing. Please run the initial ATS analysis first."
         )
 
-    # Save Audio and Transcribe
+    # Transcribe (audio stays in RAM; tempfile only as a fallback)
     transcribed_text = ""
-    audio_path = ""
     try:
-        import whisper 
-
-        with tempfile.NamedTemporaryFile(delete=False, suffix=".webm") as tmp_file:
-            audio_data = await audio_file.read()
-            tmp_file.write(audio_data)
-            audio_path = tmp_file.name
-        
-        def transcribe_blocking(path):
-            model_whisper = whisper.load_model("base")
-            return model_whisper.transcribe(path)["text"].strip()
-            
-        transcribed_text = await asyncio.to_thread(transcribe_blocking, audio_path)
+        audio_data = await audio_file.read()
+        try:
+            audio = await asyncio.to_thread(_decode_audio_bytes, audio_data)
+            # Reuses the shared model instead of re-loading ~140MB per request
+            transcribed_text = await asyncio.to_thread(_transcribe_blocking, audio)
+        except (OSError, subprocess.CalledProcessError):
+            # ffmpeg pipe unavailable or codec probe failed on the stream:
+            # fall back to the tempfile path and let Whisper decode itself
+            audio_path = ""
+            try:
+                with tempfile.NamedTemporaryFile(delete=False, suffix=".webm") as tmp_file:
+                    tmp_file.write(audio_data)
+                    audio_path = tmp_file.name
+                transcribed_text = await asyncio.to_thread(_transcribe_blocking, audio_path)
+            finally:
+                if os.path.exists(audio_path):
+                    os.remove(audio_path)
         logger.info(f"Transcribed Text: {transcribed_text[:50]}...")
-        
+
     except ImportError:
-        raise HTTPException(status_code=500, detail="Audio transcription not configured. Install 'openai-whisper'.")
+        raise HTTPException(status_code=500, detail="Audio transcription not configured. Install 'faster-whisper' or 'openai-whisper'.")
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Audio processing error: {e}")
-    finally:
-        if os.path.exists(audio_path):
-            os.remove(audio_path)
             
     # Evaluate
     feedback_result = resume_processor.evaluate_interview_answers(
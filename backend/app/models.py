@@ -0,0 +1,31 @@
+# backend/app/models.py
+
+import logging
+from functools import lru_cache
+
+import torch
+from sentence_transformers import SentenceTransformer
+
+logger = logging.getLogger("models")
+
+MODEL_NAME = "all-MiniLM-L6-v2"
+
+
+@lru_cache(maxsize=1)
+def get_sentence_model() -> SentenceTransformer:
+    """Load the shared SentenceTransformer once per process and reuse it everywhere."""
+    device = "cuda" if torch.cuda.is_available() else "cpu"
+    logger.info(f"🔹 Loading SentenceTransformer model on {device}...")
+    try:
+        # ONNX Runtime backend: fused ops give ~3-4x faster CPU encodes when
+        # optimum/onnxruntime are installed
+        model = SentenceTransformer(MODEL_NAME, backend="onnx", device=device)
+        logger.info("✅ SentenceTransformer model loaded (ONNX backend)!")
+    except Exception:
+        model = SentenceTransformer(MODEL_NAME, device=device)
+        if device == "cuda":
+            # FP16 halves the bytes moved through the encoder layers; the
+            # MiniLM forward pass is memory-bound so this is a direct win
+            model.half()
+        logger.info("✅ SentenceTransformer model loaded (PyTorch backend)!")
+    return model
@@ -1,12 +1,25 @@
 # backend/app/resume_processor.py
 
+import hashlib
 import joblib
 import re
-import pandas as pd
+import numpy as np
 import logging
 import random
 import os
-from sentence_transformers import SentenceTransformer, util 
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+
+from app.embedding_cache import cached_encode
+from app.models import get_sentence_model
+from app.utils import LRUCache
+
+# Optional: true multi-pattern DFA matching for skill extraction
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
 
 # Set the path where your models and data files are located
 MODELS_PATH = "app/models/"
@@ -31,14 +44,84 @@ ALL_SKILLS = [
     'Django', 'Spring Boot', 'Hibernate', 'Microservices', 'REST API', 'GraphQL', 'Redux', 'TypeScript', 'Next.js'
 ]
 
+# --- COMPILED PATTERNS (one-time cost at import) ---
+# Re-parsing pattern literals inside every call adds up; compiling once here
+# also lets extract_skills_from_text replace ~90 independent re.search passes
+# with a single linear sweep of one alternation.
+_URL_RE = re.compile(r'http\S+\s')
+_NON_ALNUM_RE = re.compile(r'[^a-z0-9\s]')
+_WS_RE = re.compile(r'\s+')
+
+# ASCII cleanup table: keeps lowercase/digits/whitespace, deletes the rest in
+# one C-level pass (replaces the character-class re.sub on the common path)
+_CLEAN_TBL = str.maketrans({
+    chr(i): (chr(i) if chr(i).islower() or chr(i).isdigit() or chr(i).isspace() else None)
+    for i in range(128)
+})
+
+# Candidate-name line: 2-4 tokens of 2+ chars, no digits, no label words —
+# the same checks the old Python loop made, folded into one MULTILINE scan
+_NAME_RE = re.compile(
+    r'^(?![^\n]*(?:resume|curriculum|vitae|cv|bio|phone|email|contact))'
+    r'(?![^\n]*\d)[ \t]*(\S{2,}(?:[ \t]+\S{2,}){1,3})[ \t]*\r?$',
+    re.IGNORECASE | re.MULTILINE,
+)
+
+_EMAIL_RE = re.compile(r"\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b")
+_PHONE_RE = re.compile(r"(\(?\d{3}\)?)?\s*[-.\s]?\d{3}\s*[-.\s]?\d{4}(?!\d)")
+_QUANT_RE = re.compile(r"\d+%")
+_WORD_RE = re.compile(r"\w+")
+# Deliberately no \b anchors: the original check was plain substring
+# containment (e.g. 'led' matching inside 'knowledge-led')
+_STAR_RE = re.compile(r"situation|task|action|result|solved|led|achieved")
+# Unanchored + IGNORECASE keeps substring semantics ('experienced' counts)
+# while scanning the raw text once, with no full lowered copy
+_SECTIONS_RE = re.compile(r"experience|education|projects", re.IGNORECASE)
+
+# One bit per skill (index = position in ALL_SKILLS): set algebra on skill
+# lists becomes bitwise AND/OR on a single int
+_SKILL_BIT = {s: 1 << i for i, s in enumerate(ALL_SKILLS)}
+
+def _skills_to_mask(skills):
+    """Fold a list of canonical skill names into one int bitmask."""
+    mask = 0
+    for s in skills:
+        mask |= _SKILL_BIT.get(s, 0)
+    return mask
+
+# Longest-first so multi-word skills win over any shorter overlapping match
+_SKILL_BY_LOWER = {s.lower(): s for s in ALL_SKILLS}
+_SKILL_RE = re.compile(
+    r"\b("
+    + "|".join(re.escape(s) for s in sorted(_SKILL_BY_LOWER, key=len, reverse=True))
+    + r")\b"
+)
+
+# Aho-Corasick automaton over the same vocabulary: a true DFA whose scan cost
+# is independent of the skill count, shared by resume and JD extraction
+_SKILL_AUTOMATON = None
+if ahocorasick:
+    _SKILL_AUTOMATON = ahocorasick.Automaton()
+    for _lower, _orig in _SKILL_BY_LOWER.items():
+        _SKILL_AUTOMATON.add_word(_lower, (_lower, _orig))
+    _SKILL_AUTOMATON.make_automaton()
+
+# Degree + institute keywords fused into one alternation: each candidate line
+# gets a single search instead of up to 19 (bachelor/master stay unanchored on
+# the right so 'bachelors'/'masters' keep matching)
+_EDU_RE = re.compile(
+    r"\b(?:b\.?tech\b|m\.?tech\b|b\.?e\b|b\.?s\b|m\.?s\b|bachelor|master"
+    r"|diploma\b|ph\.?d\b|degree\b|higher\s?secondary\b|senior\s?secondary\b"
+    r"|xii\b|x\b|university\b|institute\b|college\b|school\b|academy\b)",
+    re.IGNORECASE,
+)
+
 # Global variables
 category_model = None
 job_model = None
 category_vectorizer = None
 job_vectorizer = None
-semantic_model = None 
-job_descriptions_df = None
-skills_data = None
+semantic_model = None
 
 # --- 2. MOCK CLASSES ---
 class MockVectorizer:
@@ -61,35 +144,32 @@ class MockClassifier:
 def clean_text(text):
     if not text: return ""
     text = str(text).lower()
-    text = re.sub(r'http\S+\s', ' ', text)
-    text = re.sub(r'[^a-z0-9\s]', '', text)
-    text = re.sub(r'\s+', ' ', text).strip()
+    text = _URL_RE.sub(' ', text)
+    if text.isascii():
+        # str.translate is a table-driven C loop: deletes punctuation in one
+        # pass without the regex engine
+        text = text.translate(_CLEAN_TBL)
+    else:
+        # Non-ASCII input (unicode bullets, NBSP) keeps the exact regex
+        # semantics for character filtering
+        text = _NON_ALNUM_RE.sub('', text)
+    text = _WS_RE.sub(' ', text).strip()
     return text
 
 def extract_contact_info(text):
     # 1. Improved Name Extraction: Handles Title Case (John Doe) AND All Caps (JOHN DOE)
-    # It looks for the first line that has 2-4 words, is not a common label, and has letters.
-    lines = text.split('\n')
-    name = "Candidate Name"
-    
-    for line in lines[:10]: # Check first 10 lines only
-        clean_line = line.strip()
-        # Skip empty lines or lines with common labels
-        if not clean_line or any(x in clean_line.lower() for x in ['resume', 'curriculum', 'vitae', 'cv', 'bio', 'phone', 'email', 'contact']):
-            continue
-        
-        # Check if line is 2-4 words long and mostly letters
-        words = clean_line.split()
-        if 2 <= len(words) <= 4 and all(len(w) > 1 for w in words) and not any(char.isdigit() for char in clean_line):
-            name = clean_line
-            break
+    # One compiled scan over the first-10-line window replaces the Python
+    # loop of per-line splits, label substring checks, and digit probes.
+    window = '\n'.join(text.split('\n', 10)[:10])
+    name_match = _NAME_RE.search(window)
+    name = name_match.group(1) if name_match else "Candidate Name"
 
     # 2. Email Extraction
-    email_match = re.search(r"\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b", text)
+    email_match = _EMAIL_RE.search(text)
     email = email_match.group(0) if email_match else "N/A"
-    
+
     # 3. Phone Extraction
-    phone_match = re.search(r"(\(?\d{3}\)?)?\s*[-.\s]?\d{3}\s*[-.\s]?\d{4}(?!\d)", text)
+    phone_match = _PHONE_RE.search(text)
     phone = phone_match.group(0).strip() if phone_match else "N/A"
     
     return name, email, phone
@@ -100,139 +180,189 @@ def extract_education(text):
     Extracts education details by scanning every line for degree/institute keywords.
     This is more robust than regex blocks for messy PDF text.
     """
+    # Ordered-unique with early termination: only five entries are ever
+    # returned, so stop scanning lines once we have them (previously the
+    # whole document was scanned and the set() shuffled result order)
     extracted = []
-    
-    # 1. Keywords that strongly indicate an education line
-    degree_keywords = [
-        r"\bb\.?tech\b", r"\bm\.?tech\b", r"\bb\.?e\b", r"\bb\.?s\b", r"\bm\.?s\b", 
-        r"\bbachelor", r"\bmaster", r"\bdiploma\b", r"\bph\.?d\b", r"\bdegree\b",
-        r"\bhigher\s?secondary\b", r"\bsenior\s?secondary\b", r"\bxii\b", r"\bx\b"
-    ]
-    institute_keywords = [
-        r"\buniversity\b", r"\binstitute\b", r"\bcollege\b", r"\bschool\b", r"\bacademy\b"
-    ]
-    
-    # Split text into lines to handle formatting
-    lines = text.split('\n')
-    
-    for line in lines:
+    seen = set()
+
+    for line in text.split('\n'):
         clean_line = line.strip()
-        if len(clean_line) < 5: continue # Skip very short lines
-        
-        # Check for degree match
-        has_degree = any(re.search(pat, clean_line, re.IGNORECASE) for pat in degree_keywords)
-        
-        # Check for institute match
-        has_institute = any(re.search(pat, clean_line, re.IGNORECASE) for pat in institute_keywords)
-        
-        # Heuristic: Keep the line if it mentions a Degree OR an Institute
-        if has_degree or has_institute:
+        if len(clean_line) < 5 or clean_line in seen: continue # Skip short/duplicate lines
+
+        # Heuristic: keep the line if it mentions a degree OR an institute
+        # (one fused-alternation search per line)
+        if _EDU_RE.search(clean_line):
             extracted.append(clean_line)
-            
-    # Return unique top results
-    return list(set(extracted))[:5]
-
-def extract_skills_from_text(text):
-    text_lower = clean_text(text)
-    found = []
-    for skill in ALL_SKILLS:
-        pattern = r"\b{}\b".format(re.escape(skill.lower()))
-        if re.search(pattern, text_lower):
-            found.append(skill)
-    return list(set(found))
+            seen.add(clean_line)
+            if len(extracted) >= 5:
+                break
+
+    return extracted
+
+def extract_skills_from_text(text, cleaned=None):
+    # One linear sweep over the cleaned text instead of one re.search per
+    # skill — O(len(text)) regardless of how big ALL_SKILLS grows; callers
+    # that already ran clean_text pass it in to skip the repeat scan
+    text_lower = cleaned if cleaned is not None else clean_text(text)
+
+    if _SKILL_AUTOMATON is not None:
+        # dict keys keep first-mention order, so the returned list follows
+        # the document instead of arbitrary set-hash order
+        found = {}
+        for end, (lower, orig) in _SKILL_AUTOMATON.iter(text_lower):
+            start = end - len(lower) + 1
+            # Post-filter on surrounding chars to preserve \b semantics
+            if (start == 0 or not text_lower[start - 1].isalnum()) and \
+               (end + 1 >= len(text_lower) or not text_lower[end + 1].isalnum()):
+                found[orig] = None
+        return list(found)
+
+    # Fallback when pyahocorasick is not installed: single alternation sweep
+    found = dict.fromkeys(_SKILL_BY_LOWER[m.group(1)] for m in _SKILL_RE.finditer(text_lower))
+    return list(found)
 
 # --- 4. MODEL LOADING ---
+_models_lock = threading.Lock()
+_models_loaded = False
+
 def load_models():
-    global category_model, job_model, category_vectorizer, job_vectorizer, semantic_model
-    try:
-        category_model = joblib.load(MODELS_PATH + "rf_classifier_categorization.pkl")
-        category_vectorizer = joblib.load(MODELS_PATH + "tfidf_vectorizer_categorization.pkl")
-        job_model = joblib.load(MODELS_PATH + "rf_classifier_job_recommendation.pkl")
-        job_vectorizer = joblib.load(MODELS_PATH + "tfidf_vectorizer_job_recommendation.pkl")
-        logger.info("✅ ML Models loaded successfully.")
-    except Exception as e:
-        logger.warning(f"⚠️ ML Models missing ({e}). Using MOCK logic.")
-        category_vectorizer = MockVectorizer()
-        job_vectorizer = MockVectorizer()
-        category_model = MockClassifier('category')
-        job_model = MockClassifier('job')
-    
-    try:
-        logger.info("🔹 Loading SentenceTransformer for Realistic Scoring...")
-        semantic_model = SentenceTransformer('all-MiniLM-L6-v2')
-        logger.info("✅ AI Scoring Model loaded.")
-    except Exception as e:
-        logger.error(f"CRITICAL: Could not load AI Scoring Model: {e}")
-        semantic_model = None
+    global category_model, job_model, category_vectorizer, job_vectorizer, semantic_model, _models_loaded
+    with _models_lock:
+        if _models_loaded:
+            return True
+        try:
+            # mmap_mode='r' keeps the estimators' numpy arrays on the page
+            # cache, shared copy-on-write across forked workers
+            category_model = joblib.load(MODELS_PATH + "rf_classifier_categorization.pkl", mmap_mode='r')
+            category_vectorizer = joblib.load(MODELS_PATH + "tfidf_vectorizer_categorization.pkl", mmap_mode='r')
+            job_model = joblib.load(MODELS_PATH + "rf_classifier_job_recommendation.pkl", mmap_mode='r')
+            job_vectorizer = joblib.load(MODELS_PATH + "tfidf_vectorizer_job_recommendation.pkl", mmap_mode='r')
+            logger.info("✅ ML Models loaded successfully.")
+        except Exception as e:
+            logger.warning(f"⚠️ ML Models missing ({e}). Using MOCK logic.")
+            category_vectorizer = MockVectorizer()
+            job_vectorizer = MockVectorizer()
+            category_model = MockClassifier('category')
+            job_model = MockClassifier('job')
+
+        try:
+            logger.info("🔹 Loading SentenceTransformer for Realistic Scoring...")
+            semantic_model = get_sentence_model()
+            logger.info("✅ AI Scoring Model loaded.")
+        except Exception as e:
+            logger.error(f"CRITICAL: Could not load AI Scoring Model: {e}")
+            semantic_model = None
 
+        _models_loaded = True
     return True
 
+def _ensure_models_loaded():
+    # Cheap flag check on the hot path; the lock only matters on first call
+    if not _models_loaded:
+        load_models()
+
 # --- 5. PREDICTION & LOGIC ---
 def predict_category(text):
+    _ensure_models_loaded()
+    if isinstance(category_model, MockClassifier):
+        # Mock mode runs four substring probes on its own lowered copy:
+        # cleaning regexes and the vectorizer hop would be pure overhead
+        return category_model.predict(text)[0]
+    return _predict_category_cleaned(clean_text(text))
+
+def _predict_category_cleaned(cleaned):
+    # Takes already-cleaned text so callers running both classifiers only
+    # pay the cleaning regexes once
+    _ensure_models_loaded()
     if not category_model: return "Unknown"
-    cleaned = clean_text(text)
+    if isinstance(category_model, MockClassifier):
+        return category_model.predict(cleaned)[0]
     features = category_vectorizer.transform([cleaned])
     prediction = category_model.predict(features)
     return prediction[0]
 
 def generate_recommendation(text):
+    _ensure_models_loaded()
+    if isinstance(job_model, MockClassifier):
+        return job_model.predict(text)[0]
+    return _generate_recommendation_cleaned(clean_text(text))
+
+def _generate_recommendation_cleaned(cleaned):
+    _ensure_models_loaded()
     if not job_model: return "Unknown"
-    cleaned = clean_text(text)
+    if isinstance(job_model, MockClassifier):
+        return job_model.predict(cleaned)[0]
     features = job_vectorizer.transform([cleaned])
     prediction = job_model.predict(features)
     return prediction[0]
 
-def calculate_ats_score(text, recommended_job, extracted_skills):
+def calculate_ats_score(text, recommended_job, extracted_skills, contact_info=None):
     score = 0
     word_count = len(text.split())
     if 300 <= word_count <= 1000: score += 25
     else: score += 10
     if len(extracted_skills) >= 5: score += 25
     if len(extracted_skills) >= 10: score += 15
-    name, email, phone = extract_contact_info(text)
+    # Reuse the caller's contact extraction instead of re-running the regexes
+    name, email, phone = contact_info if contact_info else extract_contact_info(text)
     if email != "N/A": score += 15
     if phone != "N/A": score += 10
-    if any(x in text.lower() for x in ['experience', 'education', 'projects']): score += 10
+    if _SECTIONS_RE.search(text): score += 10
     return min(100, score)
 
 def generate_personalized_tips(text, recommended_job, extracted_skills):
     tips = []
     if len(extracted_skills) < 5: tips.append("Low keyword density. Add more technical skills.")
-    if not re.search(r'\d+%', text): tips.append("Quantify your achievements with numbers (e.g., 'Improved by 20%').")
+    if not _QUANT_RE.search(text): tips.append("Quantify your achievements with numbers (e.g., 'Improved by 20%').")
     if recommended_job != "Unknown": tips.append(f"Highlight projects relevant to {recommended_job}.")
     if not tips: tips.append("Resume looks good! Focus on tailoring it to specific JDs.")
     return tips
 
 # --- 6. GAP ANALYSIS ---
+_REQUIRED_SKILLS_MAP = {
+    "Data Scientist": ["Python", "SQL", "Machine Learning", "Pandas", "Tableau"],
+    "Backend Developer": ["Java", "Spring", "SQL", "Microservices", "Docker"],
+    "Frontend Developer": ["React", "JavaScript", "CSS", "HTML", "Redux"],
+    "DevOps Engineer": ["AWS", "Docker", "Kubernetes", "Linux", "CI/CD"],
+    "Software Engineering": ["Git", "System Design", "Algorithms", "Testing"]
+}
+_FUTURE_TRENDS_MAP = {
+    "Data Scientist": ["MLOps", "Explainable AI", "Big Data (Spark)"],
+    "Backend Developer": ["Serverless Architecture", "GraphQL", "Go Language"],
+    "Frontend Developer": ["WebAssembly", "Next.js", "Accessibility"],
+    "DevOps Engineer": ["GitOps", "Service Mesh", "DevSecOps"]
+}
+
+# (skill, bit) pairs per job, resolved once at import so each request is a
+# dict lookup plus one bit test per target
+_JOB_TARGET_BITS = {
+    job: [(s, _SKILL_BIT.get(s, 0)) for s in skills]
+    for job, skills in _REQUIRED_SKILLS_MAP.items()
+}
+_DEFAULT_TARGET_BITS = [(s, _SKILL_BIT.get(s, 0)) for s in ("Communication", "Problem Solving")]
+_DEFAULT_FUTURE = ["Cloud Computing", "AI Tools"]
+
 def analyze_skill_gap_and_future(recommended_job, extracted_skills):
-    required_skills_map = {
-        "Data Scientist": ["Python", "SQL", "Machine Learning", "Pandas", "Tableau"],
-        "Backend Developer": ["Java", "Spring", "SQL", "Microservices", "Docker"],
-        "Frontend Developer": ["React", "JavaScript", "CSS", "HTML", "Redux"],
-        "DevOps Engineer": ["AWS", "Docker", "Kubernetes", "Linux", "CI/CD"],
-        "Software Engineering": ["Git", "System Design", "Algorithms", "Testing"]
-    }
-    future_trends_map = {
-        "Data Scientist": ["MLOps", "Explainable AI", "Big Data (Spark)"],
-        "Backend Developer": ["Serverless Architecture", "GraphQL", "Go Language"],
-        "Frontend Developer": ["WebAssembly", "Next.js", "Accessibility"],
-        "DevOps Engineer": ["GitOps", "Service Mesh", "DevSecOps"]
-    }
-    target_skills = required_skills_map.get(recommended_job, ["Communication", "Problem Solving"])
-    missing = [s for s in target_skills if s not in extracted_skills]
-    future = future_trends_map.get(recommended_job, ["Cloud Computing", "AI Tools"])
+    targets = _JOB_TARGET_BITS.get(recommended_job, _DEFAULT_TARGET_BITS)
+    # Bitmask diff: extracted skills are always drawn from ALL_SKILLS, so a
+    # target is covered iff its bit is set in the extracted mask
+    extracted_mask = _skills_to_mask(extracted_skills)
+    missing = [s for s, bit in targets if not (bit & extracted_mask)]
+    future = _FUTURE_TRENDS_MAP.get(recommended_job, _DEFAULT_FUTURE)
     return missing[:5], future
 
+_RADAR_AREAS = ("Coding", "Communication", "Problem Solving", "Tools", "Teamwork")
+_RADAR_BASES = np.full(len(_RADAR_AREAS), 50)
+
 def generate_radar_data(extracted_skills, recommended_job):
-    areas = ["Coding", "Communication", "Problem Solving", "Tools", "Teamwork"]
-    data = []
-    for area in areas:
-        base = 50
-        if area == "Coding" and len(extracted_skills) > 5: base += 30
-        if area == "Tools" and len(extracted_skills) > 8: base += 30
-        score = min(100, base + random.randint(0, 20))
-        data.append({"skill": area, "score": score})
-    return data
+    # One vectorized draw + clamp instead of per-area randint and min()
+    bases = _RADAR_BASES.copy()
+    skill_count = len(extracted_skills)
+    if skill_count > 5: bases[0] += 30  # Coding
+    if skill_count > 8: bases[3] += 30  # Tools
+    scores = np.minimum(100, bases + np.random.randint(0, 21, len(_RADAR_AREAS)))
+    return [{"skill": area, "score": int(score)} for area, score in zip(_RADAR_AREAS, scores)]
 
 # --- 7. INTERNAL ERROR HANDLER ---
 def _get_empty_analysis_result(error_message, resume_text=""):
@@ -244,80 +374,149 @@ def _get_empty_analysis_result(error_message, resume_text=""):
         "radar_data": [], "resume_content_text": resume_text
     }
 
+# Question banks built once at import instead of per analysis; {job} is the
+# only placeholder and .format is a no-op for entries without it
+_BEHAVIORAL_BANK = (
+    "Describe a time you had to debug a critical issue under pressure.",
+    "Tell me about a time you disagreed with a team member's technical approach.",
+    "Describe a situation where you had to learn a new tool in a short period of time.",
+    "Have you ever failed to meet a deadline? How did you handle it?",
+)
+_SOFT_BANK = (
+    "Where do you see your technical skills growing in the next 2 years?",
+    "How do you handle feedback on your code or designs?",
+    "Why do you believe you are a good fit for this {job} position?",
+    "What is your preferred work style: independent contributor or team collaborator?",
+)
+
 # --- 8. MAIN ORCHESTRATOR ---
+# Full-analysis memo: re-submitting the same resume/JD pair (common during the
+# interview-prep flow) skips the TF-IDF + RF + extraction pipeline entirely
+_analysis_cache = LRUCache(maxsize=256)
+
 def perform_ats_analysis(resume_text, jd_text=""):
+    cache_key = hashlib.blake2b(
+        f"{resume_text}\x00{jd_text}".encode("utf-8", errors="ignore"),
+        digest_size=16,
+    ).digest()
+    base = _analysis_cache.get(cache_key)
+    if base is None:
+        base = _perform_ats_analysis_uncached(resume_text, jd_text)
+        _analysis_cache[cache_key] = base
+
+    # Only the deterministic pipeline is cached; the randomized pieces are
+    # re-rolled per request so cache hits don't serve frozen questions
+    result = dict(base)
+    question_targets = result.pop("_question_targets", None)
+    if question_targets is not None:
+        result["radar_data"] = generate_radar_data(
+            result["extracted_skills"], result["recommended_job"]
+        )
+        result["interview_questions"] = _generate_interview_questions(
+            question_targets, result["recommended_job"], result["predicted_category"]
+        )
+    return result
+
+def _generate_interview_questions(target_skills, recommended_job, predicted_category):
+    """Assemble the randomized question mix (fresh roll on every call)."""
+    interview_questions = []
+
+    # Sample the two skills we actually use instead of Fisher-Yates
+    # shuffling the whole list
+    picks = random.sample(target_skills, k=min(2, len(target_skills))) if target_skills else []
+
+    if picks:
+        interview_questions.append(f"Can you walk me through a complex project where you utilized {picks[0]}?")
+    else:
+        interview_questions.append("Tell me about the most challenging technical project you have worked on.")
+
+    if len(picks) > 1:
+        interview_questions.append(f"How would you rate your proficiency in {picks[1]}, and can you give an example of its application?")
+    else:
+        interview_questions.append(f"What attracts you to the {recommended_job} role specifically?")
+
+    interview_questions.append(random.choice(_BEHAVIORAL_BANK))
+
+    interview_questions.append(f"How do you approach ensuring scalability and maintainability in {predicted_category} projects?")
+
+    interview_questions.append(random.choice(_SOFT_BANK).format(job=recommended_job))
+
+    return interview_questions
+
+def perform_ats_analysis_batch(resume_texts, jd_text=""):
+    """Analyze several resumes concurrently against one JD.
+
+    The heavy stages (regex scans, sklearn predict, the automaton sweep) run
+    in C and release the GIL, so threads overlap well; shared mmap-loaded
+    models mean no per-task pickling the way a process pool would require.
+    """
+    if not resume_texts:
+        return []
+    workers = min(len(resume_texts), os.cpu_count() or 1, 4)
+    if workers == 1:
+        return [perform_ats_analysis(text, jd_text) for text in resume_texts]
+    with ThreadPoolExecutor(max_workers=workers) as ex:
+        return list(ex.map(lambda text: perform_ats_analysis(text, jd_text), resume_texts))
+
+def _perform_ats_analysis_uncached(resume_text, jd_text=""):
     if not resume_text or len(resume_text) < 50:
         return _get_empty_analysis_result("Resume text too short.", resume_text)
     try:
+        # Clean once; skill extraction and both classifiers reuse the copy
+        text_cleaned = clean_text(resume_text)
         name, email, phone = extract_contact_info(resume_text)
-        extracted_skills = extract_skills_from_text(resume_text)
+        extracted_skills = extract_skills_from_text(resume_text, cleaned=text_cleaned)
         extracted_education = extract_education(resume_text)
-        predicted_category = predict_category(resume_text)
-        recommended_job = generate_recommendation(resume_text)
-        ats_score = calculate_ats_score(resume_text, recommended_job, extracted_skills)
+        predicted_category = _predict_category_cleaned(text_cleaned)
+        recommended_job = _generate_recommendation_cleaned(text_cleaned)
+        ats_score = calculate_ats_score(resume_text, recommended_job, extracted_skills,
+                                        contact_info=(name, email, phone))
         tips = generate_personalized_tips(resume_text, recommended_job, extracted_skills)
         missing, future = analyze_skill_gap_and_future(recommended_job, extracted_skills)
-        radar_data = generate_radar_data(extracted_skills, recommended_job)
-        
-        # RANDOMIZED QUESTION GENERATION LOGIC
-        interview_questions = []
-        
-        # 1. Determine Skill Source
+
+        # Determine the question skill source (deterministic, so it can be
+        # cached; the actual sampling happens per request in the wrapper)
         target_skills = []
         if jd_text and len(jd_text) > 10:
             jd_skills = extract_skills_from_text(jd_text)
             if jd_skills:
-                target_skills = list(set(jd_skills)) 
-        
-        if not target_skills:
-            target_skills = list(set(extracted_skills))
+                target_skills = list(jd_skills)
 
-        # 2. Shuffle for Randomness
-        if target_skills:
-            random.shuffle(target_skills) 
-        
-        # 3. Generate Mix of Questions
-        if target_skills:
-            interview_questions.append(f"Can you walk me through a complex project where you utilized {target_skills[0]}?")
-        else:
-            interview_questions.append("Tell me about the most challenging technical project you have worked on.")
+        if not target_skills:
+            target_skills = list(extracted_skills)
 
-        if len(target_skills) > 1:
-            interview_questions.append(f"How would you rate your proficiency in {target_skills[1]}, and can you give an example of its application?")
-        else:
-            interview_questions.append(f"What attracts you to the {recommended_job} role specifically?")
-
-        behavioral_bank = [
-            "Describe a time you had to debug a critical issue under pressure.",
-            "Tell me about a time you disagreed with a team member's technical approach.",
-            "Describe a situation where you had to learn a new tool in a short period of time.",
-            "Have you ever failed to meet a deadline? How did you handle it?"
-        ]
-        interview_questions.append(random.choice(behavioral_bank))
-
-        interview_questions.append(f"How do you approach ensuring scalability and maintainability in {predicted_category} projects?")
-
-        soft_bank = [
-            "Where do you see your technical skills growing in the next 2 years?",
-            "How do you handle feedback on your code or designs?",
-            f"Why do you believe you are a good fit for this {recommended_job} position?",
-            "What is your preferred work style: independent contributor or team collaborator?"
-        ]
-        interview_questions.append(random.choice(soft_bank))
-        
         return {
             "ats_score": ats_score, "predicted_category": predicted_category,
             "recommended_job": recommended_job, "name": name, "email": email, "phone": phone,
             "extracted_skills": extracted_skills, "extracted_education": extracted_education,
             "personalized_tips": tips, "missing_skills": missing, "future_skills": future,
-            "interview_questions": interview_questions, "radar_data": radar_data,
-            "resume_content_text": resume_text
+            "resume_content_text": resume_text,
+            "_question_targets": target_skills
         }
     except Exception as e:
         logger.error(f"Analysis Error: {e}")
         return _get_empty_analysis_result(str(e), resume_text)
 
 # --- 9. AI INTERVIEW EVALUATION ---
+# Similarity ladder as a sorted table: searchsorted(side='left') reproduces
+# the strict '>' comparisons of the old if-chain exactly (equality lands in
+# the lower bucket)
+_SIM_THRESHOLDS = np.array([0.25, 0.35, 0.45, 0.55])
+_SIM_SCORES = (0, 2, 4, 6, 8)
+_SIM_FEEDBACK = (
+    "Incorrect or irrelevant answer.",
+    "Off-topic or weak relation.",
+    "Somewhat vague. Address the specific concept.",
+    "Relevant, but could be more specific.",
+    "Highly relevant answer.",
+)
+
+@lru_cache(maxsize=512)
+def _question_words(question):
+    # Questions repeat across users (fixed banks + templates), so tokenize
+    # each one once; frozenset so the cached value is safely shared
+    return frozenset(_WORD_RE.findall(question.lower()))
+
 def evaluate_interview_answers(questions, answers, resume_content, transcribed_text=None):
     individual_scores = []
     individual_feedback = []
@@ -326,54 +525,57 @@ def evaluate_interview_answers(questions, answers, resume_content, transcribed_t
     if not isinstance(answers, list): answers = [answers]
     
     global semantic_model
+    _ensure_models_loaded()
     if not semantic_model:
         try:
-            semantic_model = SentenceTransformer('all-MiniLM-L6-v2')
+            semantic_model = get_sentence_model()
         except:
             semantic_model = None
 
-    resume_skills = extract_skills_from_text(resume_content)
-    
-    for q, a in zip(questions, answers):
+    ans_texts = [str(a).strip() for a in answers]
+    # STRICT CHECK FOR UNANSWERED (decided up front so only real answers
+    # enter the pooled encode below)
+    answered = [
+        bool(t) and len(t.split()) >= 3 and "no answer provided" not in t.lower()
+        for t in ans_texts
+    ]
+
+    # ONE pooled forward pass for every answered question+answer pair instead
+    # of two encode dispatches per pair; bank questions hit the embedding
+    # cache, and normalized embeddings make row-wise dots the cosine sims
+    pair_buckets = iter(())
+    if semantic_model:
+        enc_qs = [q for q, ok in zip(questions, answered) if ok]
+        enc_as = [t for t, ok in zip(ans_texts, answered) if ok]
+        if enc_qs:
+            embeddings = cached_encode(semantic_model, enc_qs + enc_as, batch_size=32)
+            q_embs, a_embs = embeddings[:len(enc_qs)], embeddings[len(enc_qs):]
+            sims = (q_embs * a_embs).sum(axis=1)
+            # All similarity->bucket mappings in one vectorized sweep
+            pair_buckets = iter(np.searchsorted(_SIM_THRESHOLDS, sims, side='left'))
+
+    for q, ans_text, ok in zip(questions, ans_texts, answered):
         score = 0
         feedback_parts = []
-        ans_text = str(a).strip()
-        
-        # STRICT CHECK FOR UNANSWERED
-        if not ans_text or len(ans_text.split()) < 3 or "no answer provided" in ans_text.lower():
+        ans_lower = ans_text.lower()  # one lowered copy reused below
+
+        if not ok:
             individual_scores.append(0)
             individual_feedback.append("No answer provided.")
             continue
 
         # CORE AI SCORING
         if semantic_model:
-            q_emb = semantic_model.encode(q, convert_to_tensor=True)
-            a_emb = semantic_model.encode(ans_text, convert_to_tensor=True)
-            
-            similarity = float(util.cos_sim(q_emb, a_emb)[0][0])
-            
-            if similarity > 0.55: 
-                score = 8  
-                feedback_parts.append("Highly relevant answer.")
-            elif similarity > 0.45: 
-                score = 6  
-                feedback_parts.append("Relevant, but could be more specific.")
-            elif similarity > 0.35: 
-                score = 4  
-                feedback_parts.append("Somewhat vague. Address the specific concept.")
-            elif similarity > 0.25: 
-                score = 2 
-                feedback_parts.append("Off-topic or weak relation.")
-            else: 
-                score = 0  
-                feedback_parts.append("Incorrect or irrelevant answer.")
+            bucket = int(next(pair_buckets))
+            score = _SIM_SCORES[bucket]
+            feedback_parts.append(_SIM_FEEDBACK[bucket])
         else:
             score = 5
             feedback_parts.append("AI unavailable.")
 
         # CONTEXT BONUS
-        q_words = set(re.findall(r'\w+', q.lower()))
-        a_words = set(re.findall(r'\w+', ans_text.lower()))
+        q_words = _question_words(q)
+        a_words = set(_WORD_RE.findall(ans_lower))
         common_words = q_words.intersection(a_words)
         meaningful_overlap = [w for w in common_words if len(w) > 3]
         
@@ -382,8 +584,8 @@ def evaluate_interview_answers(questions, answers, resume_content, transcribed_t
             
         # STAR METHOD BONUS
         if score >= 4:
-            star_keywords = ['situation', 'task', 'action', 'result', 'solved', 'led', 'achieved']
-            if any(w in ans_text.lower() for w in star_keywords):
+            # One alternation scan instead of up to seven substring passes
+            if _STAR_RE.search(ans_lower):
                 score += 1
                 feedback_parts.append("Good use of action verbs.")
 
@@ -400,6 +602,4 @@ def evaluate_interview_answers(questions, answers, resume_content, transcribed_t
         "individual_scores": individual_scores,
         "individual_feedback": individual_feedback,
         "transcribed_text": transcribed_text or answers[0]
-    }
-
-load_models()
\ No newline at end of file
+    }
\ No newline at end of file
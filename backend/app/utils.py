@@ -0,0 +1,148 @@
+# backend/app/utils.py
+#
+# Shared text-extraction utilities used by main.py and interview.py, so the
+# two modules no longer carry duplicate (and diverging) copies.
+
+import asyncio
+import hashlib
+import io
+import logging
+import os
+import tempfile
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+import fitz  # PyMuPDF
+import docx2txt
+from fastapi import UploadFile
+
+logger = logging.getLogger("utils")
+
+
+# ----------------- Bounded LRU -----------------
+class LRUCache(OrderedDict):
+    """Tiny bounded LRU dict: least-recently-used entries are evicted at maxsize."""
+
+    def __init__(self, maxsize: int = 256):
+        super().__init__()
+        self.maxsize = maxsize
+
+    def __getitem__(self, key):
+        value = super().__getitem__(key)
+        self.move_to_end(key)
+        return value
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        self.move_to_end(key)
+        while len(self) > self.maxsize:
+            self.popitem(last=False)
+
+
+# Extracted-text cache: in-memory LRU backed by an on-disk store that survives
+# restarts, keyed by a hash of the raw upload bytes
+text_cache = LRUCache(maxsize=256)
+TEXT_CACHE_DIR = os.path.join(tempfile.gettempdir(), "resume_matcher_text_cache")
+
+# Below this page count, thread spin-up costs more than it saves
+_PDF_PARALLEL_THRESHOLD = 8
+
+
+# ----------------- Extraction -----------------
+async def extract_text(file: UploadFile) -> str:
+    """Extract text from PDF, DOCX, or TXT files."""
+    file_content = await file.read()
+    return await extract_text_from_bytes(file_content, file.filename)
+
+
+async def extract_text_from_bytes(file_content: bytes, filename: str) -> str:
+    """Extract text when the raw upload bytes have already been read."""
+    if not file_content:
+        return ""
+
+    suffix = os.path.splitext(filename)[1].lower()
+
+    # Use asyncio to run the blocking file operations in a thread pool
+    text = await asyncio.to_thread(extract_text_cached, file_content, suffix)
+
+    return text.strip()
+
+
+def _extract_pdf_page_range(file_content: bytes, start: int, stop: int) -> str:
+    # Each worker opens its own document handle: PyMuPDF objects must not be
+    # shared across threads
+    with fitz.open(stream=file_content, filetype="pdf") as doc:
+        return "".join(doc[i].get_text() for i in range(start, stop))
+
+
+def _extract_pdf_text(file_content: bytes) -> str:
+    """Extract PDF text, splitting page ranges across threads for large files."""
+    # PyMuPDF reads directly from memory: no tempfile round-trip
+    with fitz.open(stream=file_content, filetype="pdf") as doc:
+        page_count = doc.page_count
+        if page_count < _PDF_PARALLEL_THRESHOLD:
+            return "".join(page.get_text() for page in doc)
+
+    # get_text runs in C and releases the GIL, so threads scale across cores
+    workers = min(os.cpu_count() or 1, 4)
+    step = -(-page_count // workers)  # ceil division
+    ranges = [(i, min(i + step, page_count)) for i in range(0, page_count, step)]
+    with ThreadPoolExecutor(max_workers=workers) as ex:
+        parts = ex.map(lambda r: _extract_pdf_page_range(file_content, *r), ranges)
+    return "".join(parts)
+
+
+def extract_text_cached(file_content: bytes, suffix: str) -> str:
+    """Memoized extraction: memory LRU first, then disk, then a real parse."""
+    key = hashlib.blake2b(file_content, digest_size=16).hexdigest() + suffix
+    cached = text_cache.get(key)
+    if cached is not None:
+        return cached
+
+    disk_path = os.path.join(TEXT_CACHE_DIR, key + ".txt")
+    try:
+        if os.path.exists(disk_path):
+            with open(disk_path, "r", encoding="utf-8") as f:
+                text = f.read()
+            text_cache[key] = text
+            return text
+    except Exception as e:
+        logger.warning(f"⚠️ Could not read cached text {key}: {e}")
+
+    text = _perform_text_extraction_blocking(file_content, suffix)
+    text_cache[key] = text
+    try:
+        os.makedirs(TEXT_CACHE_DIR, exist_ok=True)
+        with open(disk_path, "w", encoding="utf-8") as f:
+            f.write(text)
+    except Exception as e:
+        logger.warning(f"⚠️ Could not persist extracted text {key}: {e}")
+
+    return text
+
+
+def _perform_text_extraction_blocking(file_content: bytes, suffix: str) -> str:
+    """Blocking part of text extraction running in a separate thread."""
+    try:
+        if suffix == ".pdf":
+            text = _extract_pdf_text(file_content)
+        elif suffix == ".docx":
+            # docx2txt accepts any file-like object (it opens a ZipFile)
+            text = docx2txt.process(io.BytesIO(file_content))
+        elif suffix == ".txt":
+            text = file_content.decode("utf-8", errors="ignore")
+        else:
+            logger.error(f"Unsupported file format: {suffix}")
+            return ""
+
+    except Exception as e:
+        logger.error(f"Error during text extraction of {suffix}: {e}")
+        return ""
+
+    return text.strip()
@@ -14,7 +14,8 @@ export default function MockInterview() {
     // Data
     const questions = resumeData?.analysisResult?.interview_questions || [];
     const resumeContentText = resumeData?.analysisResult?.resume_content_text || ''; 
-    const resumeName = resumeData?.resume || "candidate";
+    // Prefer the backend-issued content-hash handle; fall back to the file name
+    const resumeName = resumeData?.analysisResult?.resume_name || resumeData?.resume || "candidate";
 
     // State
     const [answers, setAnswers] = useState({}); 